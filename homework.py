@@ -1,16 +1,27 @@
+import atexit
 import logging
 import os
+import queue
+import sys
+import threading
 import time
+from collections import OrderedDict
 from http import HTTPStatus
-from logging.handlers import RotatingFileHandler
-from typing import Dict, List, Optional
+from logging.handlers import (QueueHandler, QueueListener,
+                              RotatingFileHandler)
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import orjson
 import requests
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from telegram import Bot
+from requests.adapters import HTTPAdapter
+from telegram.error import RetryAfter
+from telegram.ext import CallbackContext, Updater
 
 from exceptions import (DictEmptyError, EndPointError, ListEmptyError,
-                        SendMessageError, UndocumentedStatusError)
+                        RequestError, SendMessageError,
+                        UndocumentedStatusError)
 
 load_dotenv()
 
@@ -18,6 +29,12 @@ PRACTICUM_TOKEN: Optional[str] = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN: Optional[str] = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID: Optional[str] = os.getenv('TELEGRAM_CHAT_ID')
 
+TOKEN_NAMES: Tuple[str, ...] = (
+    'PRACTICUM_TOKEN',
+    'TELEGRAM_TOKEN',
+    'TELEGRAM_CHAT_ID',
+)
+
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -34,14 +51,30 @@ formatter = logging.Formatter(
 )
 file_log_handler.setFormatter(formatter)
 console_out_handler.setFormatter(formatter)
-logger.addHandler(file_log_handler)
-logger.addHandler(console_out_handler)
+
+log_queue: queue.Queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(log_queue))
+log_listener = QueueListener(
+    log_queue, file_log_handler, console_out_handler
+)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 RETRY_TIME: int = 600
-SECONDS_MESSAGE_TIMEOUT: int = 10
+REQUEST_TIMEOUT = (5, 30)
+MAX_SENT_REPORTS: int = 256
+TELEGRAM_MESSAGE_LIMIT: int = 4096
 ENDPOINT: str = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS: Dict[str, str] = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
 
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+NOT_MODIFIED: dict = {}
+_last_etag: Optional[str] = None
+_response_cache: TTLCache = TTLCache(maxsize=8, ttl=RETRY_TIME)
+_cache_lock = threading.Lock()
+
 
 HOMEWORK_VERDICTS: Dict[str, str] = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -49,6 +82,11 @@ HOMEWORK_VERDICTS: Dict[str, str] = {
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
 
+_STATUS_TEMPLATES: Dict[str, str] = {
+    status: f'Изменился статус проверки работы "{{}}". {verdict}'
+    for status, verdict in HOMEWORK_VERDICTS.items()
+}
+
 
 def check_tokens() -> bool:
     """Проверяет доступность переменных окружения.
@@ -59,7 +97,12 @@ def check_tokens() -> bool:
     logger.debug(
         'Проверяем доступность переменных окружения'
     )
-    return all([PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID])
+    tokens_available = True
+    for name in TOKEN_NAMES:
+        if not globals()[name]:
+            logger.critical(f'Отсутствует переменная окружения {name}')
+            tokens_available = False
+    return tokens_available
 
 
 def get_api_answer(current_timestamp: int) -> dict:
@@ -67,30 +110,47 @@ def get_api_answer(current_timestamp: int) -> dict:
     В качестве параметра функция получает временную метку.
     В случае успешного запроса должна вернуть ответ API,
     преобразовав его из формата JSON к типам данных Python.
+    Если API ответил 304 Not Modified — возвращает сентинел NOT_MODIFIED.
     """
+    global _last_etag
+    headers = dict(HEADERS)
+    if _last_etag:
+        headers['If-None-Match'] = _last_etag
     request_params = {
         'url': ENDPOINT,
-        'headers': HEADERS,
-        'params': {'from_date': current_timestamp}
+        'headers': headers,
+        'params': {'from_date': current_timestamp},
+        'timeout': REQUEST_TIMEOUT
     }
     if not isinstance(current_timestamp, (float, int)):
         raise EndPointError('Неверный формат даты')
+    with _cache_lock:
+        cached = _response_cache.get(current_timestamp)
+    if cached is not None:
+        logger.debug('Ответ API получен из кеша')
+        return cached
     logger.debug(
         f'Отправляем запрос с параметрами: {request_params}'
     )
-    response = requests.get(**request_params)
+    try:
+        response = SESSION.get(**request_params)
+    except requests.RequestException as error:
+        raise RequestError(f'Сбой при запросе к эндпоинту: {error}')
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        logger.debug('Ответ API не изменился с прошлого запроса')
+        return NOT_MODIFIED
     if response.status_code == HTTPStatus.OK:
-        return response.json()
+        _last_etag = response.headers.get('ETag')
+        answer = orjson.loads(response.content)
+        with _cache_lock:
+            _response_cache[current_timestamp] = answer
+        return answer
     if response.status_code == HTTPStatus.NOT_FOUND:
         raise EndPointError(f'Нет ответа API: {response.status_code}')
-    else:
-        response = response.json()
-        answer_code = response.get('code')
-        answer_error = response.get('error')
-        if not answer_code:
-            raise EndPointError(f'Нет ответа API: {answer_error}')
-        else:
-            raise EndPointError(f'Нет ответа API: {answer_code}')
+    content_type = response.headers.get('content-type', '')
+    body = response.json() if 'application/json' in content_type else {}
+    reason = body.get('code') or body.get('error') or response.status_code
+    raise EndPointError(f'Нет ответа API: {reason}')
 
 
 def check_response(response: Dict[str, List[dict]]) -> list:
@@ -106,9 +166,9 @@ def check_response(response: Dict[str, List[dict]]) -> list:
     )
     if not isinstance(response, dict):
         raise TypeError('Ответ API отличен от словаря')
-    if 'homeworks' not in response:
+    list_homeworks = response.get('homeworks')
+    if list_homeworks is None:
         raise KeyError('Ошибка словаря по ключу homeworks')
-    list_homeworks = response['homeworks']
     if not isinstance(list_homeworks, list):
         raise TypeError(
             'Оттвет от API под ключом `homeworks`'
@@ -129,20 +189,65 @@ def parse_status(homework: Dict[str, str]) -> str:
     logger.debug('Извлекаем статус домашней работы')
     if not homework:
         raise DictEmptyError('Домашние работы отсутствуют')
-    if 'homework_name' not in homework:
-        raise KeyError('Отсутствует ключ "homework_name" в ответе API')
-    if 'status' not in homework:
-        raise KeyError('Отсутствует ключ "status" в ответе API')
-    homework_status = homework.get('status')
-    homework_name = homework.get('homework_name')
-    if homework_status not in HOMEWORK_VERDICTS:
+    try:
+        homework_name = homework['homework_name']
+        homework_status = homework['status']
+    except KeyError as error:
+        raise KeyError(f'Отсутствует ключ {error} в ответе API')
+    try:
+        message = _STATUS_TEMPLATES[homework_status].format(homework_name)
+    except KeyError:
         raise UndocumentedStatusError(
             'Недокументированный статус домашней работы,'
             + f'обнаруженный в ответе API: {homework_status}'
         )
-    verdict = HOMEWORK_VERDICTS.get(homework_status)
-    logger.info(f'Статус работы: {verdict}')
-    return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+    logger.info(f'Статус работы: {message}')
+    return message
+
+
+def select_new_reports(
+    list_homeworks: List[dict],
+    sent_reports: OrderedDict
+) -> Tuple[List[str], List[tuple]]:
+    """Отбирает сообщения о статусах, которые ещё не отправлялись.
+    Возвращает тексты новых сообщений и их ключи
+    (homework_name, status) для пометки после успешной отправки.
+    """
+    new_messages: List[str] = []
+    new_keys: List[tuple] = []
+    for homework in list_homeworks:
+        message = parse_status(homework)
+        report_key = (
+            homework.get('homework_name'),
+            homework.get('status')
+        )
+        logger.debug('Работа {0} статус {1}'.format(*report_key))
+        if report_key in sent_reports or report_key in new_keys:
+            continue
+        new_messages.append(message)
+        new_keys.append(report_key)
+    return new_messages, new_keys
+
+
+def chunk_messages(messages: List[str]) -> Iterator[str]:
+    """Объединяет сообщения в блоки в пределах лимита Telegram.
+    Сообщения склеиваются через пустую строку; как только очередное
+    сообщение не помещается в лимит TELEGRAM_MESSAGE_LIMIT,
+    начинается новый блок.
+    """
+    chunk: List[str] = []
+    chunk_size = 0
+    for message in messages:
+        extra = len(message) + (2 if chunk else 0)
+        if chunk and chunk_size + extra > TELEGRAM_MESSAGE_LIMIT:
+            yield '\n\n'.join(chunk)
+            chunk = []
+            chunk_size = 0
+            extra = len(message)
+        chunk.append(message)
+        chunk_size += extra
+    if chunk:
+        yield '\n\n'.join(chunk)
 
 
 def send_message(bot, message: str) -> None:
@@ -154,6 +259,12 @@ def send_message(bot, message: str) -> None:
     try:
         logger.debug(f'Попытка отправить сообщение [ {message} ]')
         bot.send_message(TELEGRAM_CHAT_ID, message)
+    except RetryAfter as error:
+        logger.debug(
+            f'Превышен лимит Telegram, повтор через {error.retry_after} с.'
+        )
+        time.sleep(error.retry_after)
+        return send_message(bot, message)
     except Exception as error:
         raise SendMessageError(error)
     else:
@@ -162,43 +273,52 @@ def send_message(bot, message: str) -> None:
 
 def main() -> None:
     """Основная логика работы бота."""
-    if not check_tokens:
+    if not check_tokens():
         logger.critical('Отсутствуют одна или несколько переменных окружения')
         print('Программа принудительно остановлена.')
-        os._exit(1)
-    bot = Bot(token=str(TELEGRAM_TOKEN))
+        sys.exit(1)
     error_message: str = ''
-    current_report = {}
-    prev_report = {}
-    logger.info('Бот запущен')
-    while True:
+    sent_reports: OrderedDict = OrderedDict()
+
+    def check_homeworks(context: CallbackContext) -> None:
+        nonlocal error_message
         try:
             current_timestamp: int = int(time.time())
             response = get_api_answer(current_timestamp)
+            if response is NOT_MODIFIED:
+                return
             list_homeworks = check_response(response)
             logger.info(f'Найдено {len(list_homeworks)} работ')
-            for homework in list_homeworks:
-                current_report = {
-                    'homework_name': homework.get('homework_name'),
-                    'message': parse_status(homework),
-                    'homework_status': homework.get('status')
-                }
-                logger.debug('Работа {0} статус {1}'.format(
-                    current_report['homework_name'],
-                    current_report['homework_status']
-                ))
-                if current_report != prev_report:
-                    send_message(bot, current_report.get('message'))
-                    prev_report = current_report.copy()
-                time.sleep(SECONDS_MESSAGE_TIMEOUT)
+            new_messages, new_keys = select_new_reports(
+                list_homeworks, sent_reports
+            )
+            for chunk in chunk_messages(new_messages):
+                send_message(context.bot, chunk)
+            for report_key in new_keys:
+                sent_reports[report_key] = True
+                if len(sent_reports) > MAX_SENT_REPORTS:
+                    sent_reports.popitem(last=False)
         except Exception as error:
             message = f'Сбой в работе программы - [{error}]'
             logger.error(message)
             if error_message != message:
-                send_message(bot, message)
+                send_message(context.bot, message)
                 error_message = message
-        finally:
-            time.sleep(RETRY_TIME)
+
+    updater = Updater(
+        token=str(TELEGRAM_TOKEN),
+        request_kwargs={
+            'con_pool_size': 8,
+            'connect_timeout': 5.0,
+            'read_timeout': 20.0,
+        },
+    )
+    updater.job_queue.run_repeating(
+        check_homeworks, interval=RETRY_TIME, first=0
+    )
+    logger.info('Бот запущен')
+    updater.start_polling()
+    updater.idle()
 
 
 if __name__ == '__main__':
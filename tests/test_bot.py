@@ -1,3 +1,4 @@
+import json
 import os
 from http import HTTPStatus
 
@@ -44,6 +45,11 @@ class MockResponseGET:
         )
         self.random_timestamp = random_timestamp
         self.status_code = http_status
+        self.headers = {}
+
+    @property
+    def content(self):
+        return json.dumps(self.json()).encode()
 
     def json(self):
         data = {
@@ -180,13 +186,13 @@ class TestHomework:
 
     def test_get_api_answers(self, monkeypatch, random_timestamp,
                              current_timestamp, api_url):
-        def mock_response_get(*args, **kwargs):
+        def mock_response_get(session, *args, **kwargs):
             return MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -217,7 +223,7 @@ class TestHomework:
 
     def test_get_500_api_answer(self, monkeypatch, random_timestamp,
                                 current_timestamp, api_url):
-        def mock_500_response_get(*args, **kwargs):
+        def mock_500_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -232,7 +238,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_500_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_500_response_get)
 
         import homework
 
@@ -293,7 +299,7 @@ class TestHomework:
 
     def test_check_response(self, monkeypatch, random_timestamp,
                             current_timestamp, api_url):
-        def mock_response_get(*args, **kwargs):
+        def mock_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -315,7 +321,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -330,7 +336,7 @@ class TestHomework:
 
     def test_parse_status_unknown_status(self, monkeypatch, random_timestamp,
                                          current_timestamp, api_url):
-        def mock_response_get(*args, **kwargs):
+        def mock_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -352,7 +358,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -379,7 +385,7 @@ class TestHomework:
 
     def test_parse_status_no_status_key(self, monkeypatch, random_timestamp,
                                         current_timestamp, api_url):
-        def mock_response_get(*args, **kwargs):
+        def mock_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -400,7 +406,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -427,7 +433,7 @@ class TestHomework:
 
     def test_parse_status_no_homework_name_key(self, monkeypatch, random_timestamp,
                                                current_timestamp, api_url):
-        def mock_response_get(*args, **kwargs):
+        def mock_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -448,7 +454,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -468,7 +474,7 @@ class TestHomework:
 
     def test_check_response_no_homeworks(self, monkeypatch, random_timestamp,
                                          current_timestamp, api_url):
-        def mock_no_homeworks_response_get(*args, **kwargs):
+        def mock_no_homeworks_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -484,7 +490,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_no_homeworks_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_no_homeworks_response_get)
 
         import homework
 
@@ -503,7 +509,7 @@ class TestHomework:
 
     def test_check_response_not_dict(self, monkeypatch, random_timestamp,
                                      current_timestamp, api_url):
-        def mock_response_get(*args, **kwargs):
+        def mock_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -525,7 +531,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -544,7 +550,7 @@ class TestHomework:
 
     def test_check_response_homeworks_not_in_list(self, monkeypatch, random_timestamp,
                                                   current_timestamp, api_url):
-        def mock_response_get(*args, **kwargs):
+        def mock_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -565,7 +571,7 @@ class TestHomework:
             response.json = valid_response_json
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 
@@ -584,7 +590,7 @@ class TestHomework:
 
     def test_check_response_empty(self, monkeypatch, random_timestamp,
                                   current_timestamp, api_url):
-        def mock_empty_response_get(*args, **kwargs):
+        def mock_empty_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -599,7 +605,7 @@ class TestHomework:
             response.json = json_invalid
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_empty_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_empty_response_get)
 
         import homework
 
@@ -618,7 +624,7 @@ class TestHomework:
 
     def test_api_response_timeout(self, monkeypatch, random_timestamp,
                                   current_timestamp, api_url):
-        def mock_response_get(*args, **kwargs):
+        def mock_response_get(session, *args, **kwargs):
             response = MockResponseGET(
                 *args, random_timestamp=random_timestamp,
                 current_timestamp=current_timestamp,
@@ -626,7 +632,7 @@ class TestHomework:
             )
             return response
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(requests.Session, 'get', mock_response_get)
 
         import homework
 